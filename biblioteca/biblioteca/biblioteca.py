@@ -10,90 +10,58 @@ Funcionalidades:
 - remover livro
 """
 
-import sqlite3
-from dataclasses import dataclass, asdict
-from typing import Optional, List
+import csv
+import sys
+from dataclasses import dataclass
+
+from repositorio import SqliteRepository
 
 
 DB_PATH = "biblioteca.db"
 
 
-@dataclass
+def _int_ou(valor: str, padrao):
+    """Converte `valor` para int com um único parse; devolve `padrao` se
+    inválido ou não positivo."""
+    try:
+        v = int(valor)
+    except ValueError:
+        return padrao
+    return v if v > 0 else padrao
+
+
+# Template de linha pré-construído: o spec de formatação é analisado uma
+# vez no import, não a cada linha listada.
+_LINHA = "[{id}] {titulo} — {autor} ({ano}) | Disponível: {quantidade}"
+
+
+def _linha(item) -> str:
+    return _LINHA.format_map({
+        "id": item.id,
+        "titulo": item.titulo,
+        "autor": item.autor,
+        "ano": item.ano if item.ano is not None else "s/d",
+        "quantidade": item.quantidade,
+    })
+
+
+@dataclass(slots=True)
 class Livro:
-    id: Optional[int] = None
+    id: int | None = None
     titulo: str = ""
     autor: str = ""
-    ano: Optional[int] = None
+    ano: int | None = None
     quantidade: int = 1
 
     @classmethod
     def from_row(cls, row):
-        if row is None:
-            return None
-        return cls(id=row[0], titulo=row[1], autor=row[2], ano=row[3], quantidade=row[4])
+        # A ordem das colunas no SELECT é a mesma dos campos.
+        return cls(*row) if row is not None else None
 
 
-class RepositorioLivros:
+class RepositorioLivros(SqliteRepository):
     def __init__(self, db_path: str = DB_PATH):
-        self.db_path = db_path
-        self._criar_tabela()
-
-    def _connect(self):
-        return sqlite3.connect(self.db_path)
-
-    def _criar_tabela(self):
-        sql = """
-        CREATE TABLE IF NOT EXISTS livros (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            titulo TEXT NOT NULL,
-            autor TEXT NOT NULL,
-            ano INTEGER,
-            quantidade INTEGER NOT NULL DEFAULT 1
-        );
-        """
-        with self._connect() as conn:
-            conn.execute(sql)
-            conn.commit()
-
-    def adicionar(self, livro: Livro) -> Livro:
-        sql = "INSERT INTO livros (titulo, autor, ano, quantidade) VALUES (?, ?, ?, ?)"
-        with self._connect() as conn:
-            cur = conn.execute(sql, (livro.titulo, livro.autor, livro.ano, livro.quantidade))
-            livro.id = cur.lastrowid
-            conn.commit()
-        return livro
-
-    def atualizar(self, livro: Livro) -> None:
-        sql = "UPDATE livros SET titulo=?, autor=?, ano=?, quantidade=? WHERE id=?"
-        with self._connect() as conn:
-            conn.execute(sql, (livro.titulo, livro.autor, livro.ano, livro.quantidade, livro.id))
-            conn.commit()
-
-    def remover(self, livro_id: int) -> bool:
-        sql = "DELETE FROM livros WHERE id=?"
-        with self._connect() as conn:
-            cur = conn.execute(sql, (livro_id,))
-            conn.commit()
-            return cur.rowcount > 0
-
-    def listar_todos(self) -> List[Livro]:
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM livros ORDER BY titulo COLLATE NOCASE"
-        with self._connect() as conn:
-            rows = conn.execute(sql).fetchall()
-        return [Livro.from_row(r) for r in rows]
-
-    def buscar(self, termo: str) -> List[Livro]:
-        termo_like = f"%{termo}%"
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM livros WHERE titulo LIKE ? OR autor LIKE ? ORDER BY titulo COLLATE NOCASE"
-        with self._connect() as conn:
-            rows = conn.execute(sql, (termo_like, termo_like)).fetchall()
-        return [Livro.from_row(r) for r in rows]
-
-    def obter_por_id(self, livro_id: int) -> Optional[Livro]:
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM livros WHERE id=?"
-        with self._connect() as conn:
-            row = conn.execute(sql, (livro_id,)).fetchone()
-        return Livro.from_row(row)
+        super().__init__(db_path, "livros", Livro)
 
 
 class BibliotecaApp:
@@ -105,39 +73,60 @@ class BibliotecaApp:
         titulo = input("Título: ").strip()
         autor = input("Autor: ").strip()
         ano_raw = input("Ano (opcional): ").strip()
-        ano = int(ano_raw) if ano_raw.isdigit() else None
+        ano = _int_ou(ano_raw, None)
         qtd_raw = input("Quantidade (padrão 1): ").strip()
-        quantidade = int(qtd_raw) if qtd_raw.isdigit() and int(qtd_raw) > 0 else 1
+        quantidade = _int_ou(qtd_raw, 1)
 
         livro = Livro(titulo=titulo, autor=autor, ano=ano, quantidade=quantidade)
         livro = self.repo.adicionar(livro)
         print(f"Livro cadastrado com ID {livro.id}.\n")
 
+    def cadastrar_em_lote(self):
+        print("\n--- Cadastrar em Lote ---")
+        caminho = input("Caminho do arquivo CSV (titulo,autor,ano,quantidade): ").strip()
+        try:
+            with open(caminho, newline="", encoding="utf-8") as f:
+                linhas = list(csv.reader(f))
+        except OSError:
+            print("Não foi possível ler o arquivo.\n")
+            return
+        livros = []
+        for linha in linhas:
+            if not linha or not linha[0].strip():
+                continue
+            titulo = linha[0].strip()
+            autor = linha[1].strip() if len(linha) > 1 else ""
+            ano_raw = linha[2].strip() if len(linha) > 2 else ""
+            qtd_raw = linha[3].strip() if len(linha) > 3 else ""
+            ano = _int_ou(ano_raw, None)
+            quantidade = _int_ou(qtd_raw, 1)
+            livros.append(Livro(titulo=titulo, autor=autor, ano=ano, quantidade=quantidade))
+        if not livros:
+            print("Nenhum livro válido no arquivo.\n")
+            return
+        self.repo.adicionar_muitos(livros)
+        print(f"{len(livros)} livros cadastrados em lote.\n")
+
     def listar_livros(self):
         print("\n--- Lista de Livros ---")
-        livros = self.repo.listar_todos()
-        if not livros:
+        # Uma única escrita no stdout em vez de um print (e um write())
+        # por linha.
+        texto = "\n".join(map(_linha, self.repo.listar_todos()))
+        if not texto:
             print("Nenhum livro cadastrado.\n")
             return
-        for l in livros:
-            ano = f"{l.ano}" if l.ano is not None else "s/d"
-            print(f"[{l.id}] {l.titulo} — {l.autor} ({ano}) | Disponível: {l.quantidade}")
-        print("")
+        sys.stdout.write(texto + "\n\n")
 
     def buscar_livro(self):
         termo = input("\nDigite título ou autor para buscar: ").strip()
         if not termo:
             print("Termo vazio.\n")
             return
-        encontrados = self.repo.buscar(termo)
-        if not encontrados:
+        texto = "\n".join(map(_linha, self.repo.buscar(termo)))
+        if not texto:
             print("Nenhum resultado encontrado.\n")
             return
-        print(f"\nResultados para '{termo}':")
-        for l in encontrados:
-            ano = f"{l.ano}" if l.ano is not None else "s/d"
-            print(f"[{l.id}] {l.titulo} — {l.autor} ({ano}) | Disponível: {l.quantidade}")
-        print("")
+        sys.stdout.write(f"\nResultados para '{termo}':\n" + texto + "\n\n")
 
     def remover_livro(self):
         try:
@@ -157,16 +146,13 @@ class BibliotecaApp:
         except ValueError:
             print("ID inválido.\n")
             return
-        livro = self.repo.obter_por_id(livro_id)
-        if not livro:
-            print("Livro não encontrado.\n")
-            return
-        if livro.quantidade <= 0:
+        livro = self.repo.emprestar(livro_id)
+        if livro:
+            print(f"Livro '{livro.titulo}' emprestado. Restam {livro.quantidade} cópias.\n")
+        elif self.repo.obter_por_id(livro_id):
             print("Nenhuma cópia disponível para empréstimo.\n")
-            return
-        livro.quantidade -= 1
-        self.repo.atualizar(livro)
-        print(f"Livro '{livro.titulo}' emprestado. Restam {livro.quantidade} cópias.\n")
+        else:
+            print("Livro não encontrado.\n")
 
     def devolver(self):
         try:
@@ -174,12 +160,10 @@ class BibliotecaApp:
         except ValueError:
             print("ID inválido.\n")
             return
-        livro = self.repo.obter_por_id(livro_id)
+        livro = self.repo.devolver(livro_id)
         if not livro:
             print("Livro não encontrado.\n")
             return
-        livro.quantidade += 1
-        self.repo.atualizar(livro)
         print(f"Livro '{livro.titulo}' devolvido. Disponível: {livro.quantidade} cópias.\n")
 
     def editar_livro(self):
@@ -196,9 +180,9 @@ class BibliotecaApp:
         titulo = input(f"Título [{livro.titulo}]: ").strip() or livro.titulo
         autor = input(f"Autor [{livro.autor}]: ").strip() or livro.autor
         ano_raw = input(f"Ano [{livro.ano if livro.ano else 's/d'}]: ").strip()
-        ano = int(ano_raw) if ano_raw.isdigit() else livro.ano
+        ano = _int_ou(ano_raw, livro.ano)
         qtd_raw = input(f"Quantidade [{livro.quantidade}]: ").strip()
-        quantidade = int(qtd_raw) if qtd_raw.isdigit() else livro.quantidade
+        quantidade = _int_ou(qtd_raw, livro.quantidade)
 
         livro.titulo = titulo
         livro.autor = autor
@@ -217,10 +201,13 @@ class BibliotecaApp:
             print("5 - Remover livro")
             print("6 - Emprestar livro")
             print("7 - Devolver livro")
+            print("8 - Cadastrar em lote (CSV)")
             print("0 - Sair")
             opc = input("Escolha uma opção: ").strip()
             if opc == "1":
                 self.cadastrar_livro()
+            elif opc == "8":
+                self.cadastrar_em_lote()
             elif opc == "2":
                 self.listar_livros()
             elif opc == "3":
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# repositorio.py
+"""
+Repositório SQLite genérico compartilhado por biblioteca.py e usuario.py.
+
+As duas tabelas têm o mesmo formato (id, titulo, autor, ano, quantidade);
+parametrizar o nome da tabela e o dataclass evita manter duas cópias de
+cada otimização (PRAGMAs, FTS, índices, batch insert).
+"""
+
+import functools
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+# Intervalo ocioso, em segundos, após o qual o worker de escrita roda um
+# checkpoint passivo do WAL fora do caminho do menu.
+_CHECKPOINT_OCIOSO = 60.0
+
+T = TypeVar("T")
+
+
+class SqliteRepository(Generic[T]):
+    def __init__(self, db_path: str, table: str, dc_cls: type[T]):
+        self.db_path = db_path
+        self.table = table
+        self.dc_cls = dc_cls
+        # Uma única conexão por repositório: evita reabrir o arquivo (e
+        # reler os metadados do WAL) a cada operação do menu. O statement
+        # cache maior evita recompilar o bytecode VDBE das consultas abaixo.
+        # isolation_level=None desliga a máquina de transações implícitas do
+        # sqlite3: cada comando é sua própria transação e só os lotes abrem
+        # BEGIN explícito.
+        self._conn = sqlite3.connect(
+            db_path, isolation_level=None, cached_statements=256, check_same_thread=False
+        )
+        self._criar_tabela()
+        # SQL montado uma vez por instância: strings idênticas a cada chamada
+        # garantem hit no statement cache da conexão.
+        self._sql_add = f"INSERT INTO {table} (titulo, autor, ano, quantidade) VALUES (?, ?, ?, ?)"
+        self._sql_upd = f"UPDATE {table} SET titulo=?, autor=?, ano=?, quantidade=? WHERE id=?"
+        self._sql_del = f"DELETE FROM {table} WHERE id=?"
+        self._sql_listar = (
+            f"SELECT id, titulo, autor, ano, quantidade FROM {table} ORDER BY titulo COLLATE NOCASE"
+        )
+        self._sql_buscar = f"""
+        SELECT t.id, t.titulo, t.autor, t.ano, t.quantidade
+        FROM {table} t JOIN {table}_fts f ON f.rowid = t.id
+        WHERE {table}_fts MATCH ?
+        ORDER BY bm25({table}_fts)
+        """
+        self._sql_obter = f"SELECT id, titulo, autor, ano, quantidade FROM {table} WHERE id=?"
+        self._sql_emprestar = f"""
+        UPDATE {table} SET quantidade = quantidade - 1
+        WHERE id=? AND quantidade > 0
+        RETURNING id, titulo, autor, ano, quantidade
+        """
+        self._sql_devolver = f"""
+        UPDATE {table} SET quantidade = quantidade + 1
+        WHERE id=?
+        RETURNING id, titulo, autor, ano, quantidade
+        """
+        # Cursor reutilizado pelas operações de escrita.
+        self._cursor = self._conn.cursor()
+        # Cache LRU por instância: edições repetidas no mesmo ID viram um
+        # lookup em dict. Qualquer escrita limpa o cache inteiro — o CLI é
+        # single-writer, então isso basta para manter a consistência.
+        self._obter_cached = functools.lru_cache(maxsize=1024)(self._obter_db)
+        # Escritas fire-and-forget vão para um worker em segundo plano, que
+        # também roda wal_checkpoint(PASSIVE) quando a fila fica ociosa —
+        # assim um checkpoint longo nunca trava o loop do menu. O módulo
+        # sqlite3 é serializado (threadsafety=3), então a conexão pode ser
+        # compartilhada entre as threads.
+        self._write_queue: queue.Queue = queue.Queue()
+        # Erro de uma escrita enfileirada; re-levantado na próxima barreira
+        # para o chamador ver a falha em vez de ela sumir no worker.
+        self._erro_escrita: Exception | None = None
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            try:
+                item = self._write_queue.get(timeout=_CHECKPOINT_OCIOSO)
+            except queue.Empty:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+                except sqlite3.Error:
+                    pass  # checkpoint passivo é oportunista; tenta de novo depois
+                continue
+            try:
+                if item is None:
+                    return
+                sql, params = item
+                try:
+                    self._conn.execute(sql, params)
+                except Exception as exc:
+                    # Worker sobrevive a escritas que falham (ex.: database
+                    # is locked); o erro é entregue na próxima barreira.
+                    self._erro_escrita = exc
+            finally:
+                self._write_queue.task_done()
+
+    def _drenar_escritas(self):
+        # Barreira antes de qualquer acesso síncrono: garante que escritas
+        # enfileiradas já estejam aplicadas (read-your-writes) e propaga a
+        # falha de qualquer escrita enfileirada que deu errado.
+        self._write_queue.join()
+        if self._erro_escrita is not None:
+            erro, self._erro_escrita = self._erro_escrita, None
+            raise erro
+
+    def close(self):
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+        self._conn.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _criar_tabela(self):
+        t = self.table
+        conn = self._conn
+        # PRAGMAs fora do script: journal_mode não pode mudar dentro de uma
+        # transação aberta. WAL persiste no cabeçalho do arquivo; basta
+        # ativar uma vez aqui e as próximas conexões herdam o modo.
+        conn.execute("PRAGMA journal_mode=WAL;").fetchone()
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        # Cache de páginas de 64 MB (valor negativo = KiB) + mmap de 256 MB:
+        # as leituras do menu saem da RAM em vez de pread() por página.
+        conn.execute("PRAGMA cache_size=-65536;")
+        conn.execute("PRAGMA mmap_size=268435456;")
+        # Todo o DDL em um executescript dentro de uma única transação:
+        # um fsync para o bootstrap inteiro.
+        # - id INTEGER PRIMARY KEY é alias do rowid: obter_por_id desce uma
+        #   única B-tree, e sem AUTOINCREMENT não há manutenção de
+        #   sqlite_sequence a cada INSERT;
+        # - {t}_fts é o índice invertido da busca (FTS5 com conteúdo
+        #   externo), mantido em sincronia pelos triggers; na primeira
+        #   criação da tabela virtual o 'rebuild' reindexa linhas gravadas
+        #   antes de os triggers existirem (bancos do esquema antigo), senão
+        #   buscar não as encontra e o primeiro UPDATE/DELETE nelas corrompe
+        #   o índice — depois disso os triggers bastam, e repetir o rebuild
+        #   custaria O(N) e um WAL inteiro por lançamento;
+        # - o índice de listagem segue a collation do ORDER BY de
+        #   listar_todos e cobre todas as colunas do SELECT, então a
+        #   listagem sai inteira das páginas do índice.
+        fts_existe = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (f"{t}_fts",)
+        ).fetchone() is not None
+        rebuild = "" if fts_existe else f"INSERT INTO {t}_fts({t}_fts) VALUES('rebuild');"
+        conn.executescript(f"""
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS {t} (
+            id INTEGER PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            autor TEXT NOT NULL,
+            ano INTEGER,
+            quantidade INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS {t}_fts USING fts5(
+            titulo, autor,
+            content='{t}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        {rebuild}
+        CREATE TRIGGER IF NOT EXISTS {t}_ai AFTER INSERT ON {t} BEGIN
+            INSERT INTO {t}_fts(rowid, titulo, autor) VALUES (new.id, new.titulo, new.autor);
+        END;
+        CREATE TRIGGER IF NOT EXISTS {t}_ad AFTER DELETE ON {t} BEGIN
+            INSERT INTO {t}_fts({t}_fts, rowid, titulo, autor) VALUES ('delete', old.id, old.titulo, old.autor);
+        END;
+        CREATE TRIGGER IF NOT EXISTS {t}_au AFTER UPDATE ON {t} BEGIN
+            INSERT INTO {t}_fts({t}_fts, rowid, titulo, autor) VALUES ('delete', old.id, old.titulo, old.autor);
+            INSERT INTO {t}_fts(rowid, titulo, autor) VALUES (new.id, new.titulo, new.autor);
+        END;
+        DROP INDEX IF EXISTS idx_{t}_titulo_nocase;
+        CREATE INDEX IF NOT EXISTS idx_{t}_listagem
+            ON {t}(titulo COLLATE NOCASE, autor, ano, quantidade);
+        ANALYZE {t};
+        COMMIT;
+        """)
+
+    def adicionar(self, item: T) -> T:
+        self._drenar_escritas()
+        cur = self._cursor
+        cur.execute(self._sql_add, (item.titulo, item.autor, item.ano, item.quantidade))
+        item.id = cur.lastrowid
+        self._obter_cached.cache_clear()
+        return item
+
+    def adicionar_muitos(self, itens: list[T]) -> list[T]:
+        if not itens:
+            return itens
+        self._drenar_escritas()
+        conn = self._conn
+        # Uma transação só para o lote inteiro: um fsync em vez de N. Em
+        # autocommit não existe o rollback implícito do `with conn:` do
+        # código original, então desfaz explicitamente se o lote falhar —
+        # senão a transação fica aberta e engole as escritas seguintes.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._cursor.executemany(
+                self._sql_add,
+                [(i.titulo, i.autor, i.ano, i.quantidade) for i in itens],
+            )
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        # IDs são sequenciais dentro da transação; recupera a faixa a partir
+        # do último rowid inserido.
+        ultimo = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        primeiro = ultimo - len(itens) + 1
+        for i, item in enumerate(itens):
+            item.id = primeiro + i
+        self._obter_cached.cache_clear()
+        return itens
+
+    def _cursor_objetos(self):
+        # row_factory no cursor: o dataclass é construído direto na camada C
+        # do sqlite3, sem lista intermediária de tuplas.
+        cur = self._conn.cursor()
+        cur.row_factory = lambda _cur, row: self.dc_cls(*row)
+        return cur
+
+    def atualizar(self, item: T) -> None:
+        # Fire-and-forget: o UPDATE roda no worker e o menu segue sem
+        # esperar o fsync; leituras posteriores drenam a fila antes.
+        self._write_queue.put(
+            (self._sql_upd, (item.titulo, item.autor, item.ano, item.quantidade, item.id))
+        )
+        self._obter_cached.cache_clear()
+
+    def remover(self, item_id: int) -> bool:
+        self._drenar_escritas()
+        cur = self._cursor
+        cur.execute(self._sql_del, (item_id,))
+        self._obter_cached.cache_clear()
+        return cur.rowcount > 0
+
+    def listar_todos(self) -> Iterator[T]:
+        self._drenar_escritas()
+        cur = self._cursor_objetos()
+        cur.execute(self._sql_listar)
+        # fetchmany amortiza o custo de step do cursor sem materializar a
+        # tabela inteira em memória.
+        while lote := cur.fetchmany(256):
+            yield from lote
+
+    def buscar(self, termo: str) -> Iterator[T]:
+        # Busca por prefixo no índice FTS5, ordenada por relevância (bm25).
+        # O termo vai entre aspas para que pontuação não vire operador FTS.
+        consulta = '"' + termo.replace('"', '""') + '"*'
+        self._drenar_escritas()
+        cur = self._cursor_objetos()
+        cur.execute(self._sql_buscar, (consulta,))
+        while lote := cur.fetchmany(256):
+            yield from lote
+
+    def _obter_db(self, item_id: int) -> T | None:
+        self._drenar_escritas()
+        return self._cursor_objetos().execute(self._sql_obter, (item_id,)).fetchone()
+
+    def obter_por_id(self, item_id: int) -> T | None:
+        return self._obter_cached(item_id)
+
+    def emprestar(self, item_id: int) -> T | None:
+        # UPDATE condicional único: decrementa e lê o resultado na mesma
+        # passada, sem a janela SELECT→UPDATE.
+        self._drenar_escritas()
+        item = self._cursor_objetos().execute(self._sql_emprestar, (item_id,)).fetchone()
+        if item is not None:
+            self._obter_cached.cache_clear()
+        return item
+
+    def devolver(self, item_id: int) -> T | None:
+        self._drenar_escritas()
+        item = self._cursor_objetos().execute(self._sql_devolver, (item_id,)).fetchone()
+        if item is not None:
+            self._obter_cached.cache_clear()
+        return item
@@ -10,90 +10,58 @@ Funcionalidades:
 - remover usuário
 """
 
-import sqlite3
-from dataclasses import dataclass, asdict
-from typing import Optional, List
+import csv
+import sys
+from dataclasses import dataclass
+
+from repositorio import SqliteRepository
 
 
 DB_PATH = "biblioteca.db"
 
 
-@dataclass
+def _int_ou(valor: str, padrao):
+    """Converte `valor` para int com um único parse; devolve `padrao` se
+    inválido ou não positivo."""
+    try:
+        v = int(valor)
+    except ValueError:
+        return padrao
+    return v if v > 0 else padrao
+
+
+# Template de linha pré-construído: o spec de formatação é analisado uma
+# vez no import, não a cada linha listada.
+_LINHA = "[{id}] {titulo} — {autor} ({ano}) | Disponível: {quantidade}"
+
+
+def _linha(item) -> str:
+    return _LINHA.format_map({
+        "id": item.id,
+        "titulo": item.titulo,
+        "autor": item.autor,
+        "ano": item.ano if item.ano is not None else "s/d",
+        "quantidade": item.quantidade,
+    })
+
+
+@dataclass(slots=True)
 class Usuario:
-    id: Optional[int] = None
+    id: int | None = None
     titulo: str = ""
     autor: str = ""
-    ano: Optional[int] = None
+    ano: int | None = None
     quantidade: int = 1
 
     @classmethod
     def from_row(cls, row):
-        if row is None:
-            return None
-        return cls(id=row[0], titulo=row[1], autor=row[2], ano=row[3], quantidade=row[4])
+        # A ordem das colunas no SELECT é a mesma dos campos.
+        return cls(*row) if row is not None else None
 
 
-class RepositorioUsuarios:
+class RepositorioUsuarios(SqliteRepository):
     def __init__(self, db_path: str = DB_PATH):
-        self.db_path = db_path
-        self._criar_tabela()
-
-    def _connect(self):
-        return sqlite3.connect(self.db_path)
-
-    def _criar_tabela(self):
-        sql = """
-        CREATE TABLE IF NOT EXISTS usuarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            titulo TEXT NOT NULL,
-            autor TEXT NOT NULL,
-            ano INTEGER,
-            quantidade INTEGER NOT NULL DEFAULT 1
-        );
-        """
-        with self._connect() as conn:
-            conn.execute(sql)
-            conn.commit()
-
-    def adicionar(self, usuario: Usuario) -> Usuario:
-        sql = "INSERT INTO usuarios (titulo, autor, ano, quantidade) VALUES (?, ?, ?, ?)"
-        with self._connect() as conn:
-            cur = conn.execute(sql, (usuario.titulo, usuario.autor, usuario.ano, usuario.quantidade))
-            usuario.id = cur.lastrowid
-            conn.commit()
-        return usuario
-
-    def atualizar(self, usuario: Usuario) -> None:
-        sql = "UPDATE usuarios SET titulo=?, autor=?, ano=?, quantidade=? WHERE id=?"
-        with self._connect() as conn:
-            conn.execute(sql, (usuario.titulo, usuario.autor, usuario.ano, usuario.quantidade, usuario.id))
-            conn.commit()
-
-    def remover(self, usuario_id: int) -> bool:
-        sql = "DELETE FROM usuarios WHERE id=?"
-        with self._connect() as conn:
-            cur = conn.execute(sql, (usuario_id,))
-            conn.commit()
-            return cur.rowcount > 0
-
-    def listar_todos(self) -> List[Usuario]:
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM usuarios ORDER BY titulo COLLATE NOCASE"
-        with self._connect() as conn:
-            rows = conn.execute(sql).fetchall()
-        return [Usuario.from_row(r) for r in rows]
-
-    def buscar(self, termo: str) -> List[Usuario]:
-        termo_like = f"%{termo}%"
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM usuarios WHERE titulo LIKE ? OR autor LIKE ? ORDER BY titulo COLLATE NOCASE"
-        with self._connect() as conn:
-            rows = conn.execute(sql, (termo_like, termo_like)).fetchall()
-        return [Usuario.from_row(r) for r in rows]
-
-    def obter_por_id(self, usuario_id: int) -> Optional[Usuario]:
-        sql = "SELECT id, titulo, autor, ano, quantidade FROM usuarios WHERE id=?"
-        with self._connect() as conn:
-            row = conn.execute(sql, (usuario_id,)).fetchone()
-        return Usuario.from_row(row)
+        super().__init__(db_path, "usuarios", Usuario)
 
 
 class BibliotecaApp:
@@ -105,39 +73,60 @@ class BibliotecaApp:
         titulo = input("Título: ").strip()
         autor = input("Autor: ").strip()
         ano_raw = input("Ano (opcional): ").strip()
-        ano = int(ano_raw) if ano_raw.isdigit() else None
+        ano = _int_ou(ano_raw, None)
         qtd_raw = input("Quantidade (padrão 1): ").strip()
-        quantidade = int(qtd_raw) if qtd_raw.isdigit() and int(qtd_raw) > 0 else 1
+        quantidade = _int_ou(qtd_raw, 1)
 
         usuario = Usuario(titulo=titulo, autor=autor, ano=ano, quantidade=quantidade)
         usuario = self.repo.adicionar(usuario)
         print(f"Usuário cadastrado com ID {usuario.id}.\n")
 
+    def cadastrar_em_lote(self):
+        print("\n--- Cadastrar em Lote ---")
+        caminho = input("Caminho do arquivo CSV (titulo,autor,ano,quantidade): ").strip()
+        try:
+            with open(caminho, newline="", encoding="utf-8") as f:
+                linhas = list(csv.reader(f))
+        except OSError:
+            print("Não foi possível ler o arquivo.\n")
+            return
+        usuarios = []
+        for linha in linhas:
+            if not linha or not linha[0].strip():
+                continue
+            titulo = linha[0].strip()
+            autor = linha[1].strip() if len(linha) > 1 else ""
+            ano_raw = linha[2].strip() if len(linha) > 2 else ""
+            qtd_raw = linha[3].strip() if len(linha) > 3 else ""
+            ano = _int_ou(ano_raw, None)
+            quantidade = _int_ou(qtd_raw, 1)
+            usuarios.append(Usuario(titulo=titulo, autor=autor, ano=ano, quantidade=quantidade))
+        if not usuarios:
+            print("Nenhum usuário válido no arquivo.\n")
+            return
+        self.repo.adicionar_muitos(usuarios)
+        print(f"{len(usuarios)} usuários cadastrados em lote.\n")
+
     def listar_usuarios(self):
         print("\n--- Lista de Usuários ---")
-        usuarios = self.repo.listar_todos()
-        if not usuarios:
+        # Uma única escrita no stdout em vez de um print (e um write())
+        # por linha.
+        texto = "\n".join(map(_linha, self.repo.listar_todos()))
+        if not texto:
             print("Nenhum usuário cadastrado.\n")
             return
-        for u in usuarios:
-            ano = f"{u.ano}" if u.ano is not None else "s/d"
-            print(f"[{u.id}] {u.titulo} — {u.autor} ({ano}) | Disponível: {u.quantidade}")
-        print("")
+        sys.stdout.write(texto + "\n\n")
 
     def buscar_usuario(self):
         termo = input("\nDigite título ou autor para buscar: ").strip()
         if not termo:
             print("Termo vazio.\n")
             return
-        encontrados = self.repo.buscar(termo)
-        if not encontrados:
+        texto = "\n".join(map(_linha, self.repo.buscar(termo)))
+        if not texto:
             print("Nenhum resultado encontrado.\n")
             return
-        print(f"\nResultados para '{termo}':")
-        for u in encontrados:
-            ano = f"{u.ano}" if u.ano is not None else "s/d"
-            print(f"[{u.id}] {u.titulo} — {u.autor} ({ano}) | Disponível: {u.quantidade}")
-        print("")
+        sys.stdout.write(f"\nResultados para '{termo}':\n" + texto + "\n\n")
 
     def remover_usuario(self):
         try:
@@ -157,16 +146,13 @@ class BibliotecaApp:
         except ValueError:
             print("ID inválido.\n")
             return
-        usuario = self.repo.obter_por_id(usuario_id)
-        if not usuario:
-            print("Usuário não encontrado.\n")
-            return
-        if usuario.quantidade <= 0:
+        usuario = self.repo.emprestar(usuario_id)
+        if usuario:
+            print(f"Usuário '{usuario.titulo}' emprestado. Restam {usuario.quantidade}.\n")
+        elif self.repo.obter_por_id(usuario_id):
             print("Nenhuma cópia disponível.\n")
-            return
-        usuario.quantidade -= 1
-        self.repo.atualizar(usuario)
-        print(f"Usuário '{usuario.titulo}' emprestado. Restam {usuario.quantidade}.\n")
+        else:
+            print("Usuário não encontrado.\n")
 
     def devolver(self):
         try:
@@ -174,12 +160,10 @@ class BibliotecaApp:
         except ValueError:
             print("ID inválido.\n")
             return
-        usuario = self.repo.obter_por_id(usuario_id)
+        usuario = self.repo.devolver(usuario_id)
         if not usuario:
             print("Usuário não encontrado.\n")
             return
-        usuario.quantidade += 1
-        self.repo.atualizar(usuario)
         print(f"Usuário '{usuario.titulo}' devolvido. Disponível: {usuario.quantidade}.\n")
 
     def editar_usuario(self):
@@ -197,9 +181,9 @@ class BibliotecaApp:
         titulo = input(f"Título [{usuario.titulo}]: ").strip() or usuario.titulo
         autor = input(f"Autor [{usuario.autor}]: ").strip() or usuario.autor
         ano_raw = input(f"Ano [{usuario.ano if usuario.ano else 's/d'}]: ").strip()
-        ano = int(ano_raw) if ano_raw.isdigit() else usuario.ano
+        ano = _int_ou(ano_raw, usuario.ano)
         qtd_raw = input(f"Quantidade [{usuario.quantidade}]: ").strip()
-        quantidade = int(qtd_raw) if qtd_raw.isdigit() else usuario.quantidade
+        quantidade = _int_ou(qtd_raw, usuario.quantidade)
 
         usuario.titulo = titulo
         usuario.autor = autor
@@ -218,10 +202,13 @@ class BibliotecaApp:
             print("5 - Remover usuário")
             print("6 - Emprestar usuário")
             print("7 - Devolver usuário")
+            print("8 - Cadastrar em lote (CSV)")
             print("0 - Sair")
             opc = input("Escolha uma opção: ").strip()
             if opc == "1":
                 self.cadastrar_usuario()
+            elif opc == "8":
+                self.cadastrar_em_lote()
             elif opc == "2":
                 self.listar_usuarios()
             elif opc == "3":
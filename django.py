@@ -25,16 +25,42 @@ class Obra(models.Model):
     tipo = models.CharField(max_length=20, choices=TIPOS_ARTE)
     imagem = models.ImageField(upload_to='obras/', blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['tipo']),
+            models.Index(fields=['ano']),
+        ]
+
     def __str__(self):
         return self.titulo
 
+    @classmethod
+    def com_artista(cls):
+        # Evita o N+1 Obra→Artista: o JOIN vem na mesma consulta.
+        return cls.objects.select_related('artista')
+
 
 class Exposicao(models.Model):
     nome = models.CharField(max_length=100)
     local = models.CharField(max_length=100)
     data_inicio = models.DateField()
     data_fim = models.DateField()
-    obras = models.ManyToManyField(Obra)
+    # Tabela de junção explícita: o unique_together do through gera o
+    # índice composto (exposicao, obra) usado na travessia reversa.
+    obras = models.ManyToManyField(Obra, through='ExposicaoObra')
 
     def __str__(self):
         return self.nome
+
+    @classmethod
+    def com_obras_e_artistas(cls):
+        # Colapsa o N+1 Exposicao→Obra→Artista em 2 consultas.
+        return cls.objects.prefetch_related('obras__artista')
+
+
+class ExposicaoObra(models.Model):
+    exposicao = models.ForeignKey(Exposicao, on_delete=models.CASCADE)
+    obra = models.ForeignKey(Obra, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ('exposicao', 'obra')